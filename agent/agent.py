@@ -7,13 +7,17 @@ Uses the Claude Agent SDK to orchestrate a sequence of OAPE skills that:
 3. PR #3: e2e-generate → review-and-fix → raise PR
 """
 
+import atexit
 import csv
+import io
 import json
 import logging
+import queue
 import tempfile
 import traceback
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from claude_agent_sdk import (
@@ -32,16 +36,93 @@ PLUGIN_DIR = str(Path(__file__).resolve().parent.parent / "plugins" / "oape")
 
 CONVERSATION_LOG = Path("/tmp/conversation.log")
 
+# Separator line framing each workflow run in the conversation log.
+_RULE = "=" * 60
+
+
+class _BatchedFileHandler(logging.FileHandler):
+    """FileHandler that writes the records of a burst in one write.
+
+    Meant to sit behind a QueueListener: records are buffered while more
+    are waiting in ``log_queue`` and written with a single write and flush
+    once the queue drains or ``capacity`` records are buffered, so the file
+    is current whenever the agent goes quiet.
+    """
+
+    def __init__(self, filename: Path, log_queue: queue.SimpleQueue, capacity: int = 256):
+        super().__init__(filename)
+        self.log_queue = log_queue
+        self.capacity = capacity
+        self._pending: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._pending) >= self.capacity or self.log_queue.empty():
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._pending and self.stream:
+                self.stream.write("".join(self._pending))
+                self._pending.clear()
+            super().flush()
+        finally:
+            self.release()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records unformatted so the listener thread formats them."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# The file is written from a listener thread so that logging inside the
+# message loop never blocks the event loop on disk I/O.
 conv_logger = logging.getLogger("conversation")
 conv_logger.setLevel(logging.INFO)
-_handler = logging.FileHandler(CONVERSATION_LOG)
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_handler = _BatchedFileHandler(CONVERSATION_LOG, _log_queue)
 _handler.setFormatter(logging.Formatter("%(message)s"))
-conv_logger.addHandler(_handler)
+conv_logger.addHandler(_DeferredQueueHandler(_log_queue))
+_listener = QueueListener(_log_queue, _handler)
+_listener.start()
+atexit.register(_listener.stop)
+
 
-with open(Path(__file__).resolve().parent.parent / "config" / "config.json") as cf:
-    CONFIGS = json.loads(cf.read())
+def _log(role: str, content: object) -> None:
+    """Log a conversation entry; formatting happens on the listener thread."""
+    conv_logger.info("[%s] %s", role, content)
 
-@dataclass
+
+CONFIGS = json.loads(
+    (Path(__file__).resolve().parent.parent / "config" / "config.json").read_bytes()
+)
+ALLOWED_TOOLS = tuple(CONFIGS["claude_allowed_tools"])
+
+# Agent options shared by every run; only the working directory varies.
+_OPTIONS_TEMPLATE = {
+    "system_prompt": (
+        "You are an OpenShift operator code generation assistant. "
+        "Follow the workflow instructions precisely and execute each step. "
+        "Use the OAPE plugins to generate code, tests, and reviews. "
+        "Create git branches, commits, and pull requests as instructed. "
+        "IMPORTANT: This is a fully automated pipeline. Execute ALL steps "
+        "and ALL PRs without pausing, asking for confirmation, or waiting "
+        "for user input. Never ask 'should I proceed?' or 'shall I continue?'. "
+        "Complete the entire workflow autonomously in one run."
+    ),
+    "permission_mode": "bypassPermissions",
+    "allowed_tools": ALLOWED_TOOLS,
+    "plugins": [{"type": "local", "path": PLUGIN_DIR}],
+}
+
+@dataclass(slots=True)
 class PRResult:
     """Result of a single PR creation."""
 
@@ -51,7 +132,7 @@ class PRResult:
     title: str
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowResult:
     """Result returned after running the full workflow."""
 
@@ -142,6 +223,7 @@ async def run_workflow(
     repo_url: str,
     base_branch: str,
     on_message: Callable[[dict], None] | None = None,
+    keep_conversation: bool = True,
 ) -> WorkflowResult:
     """Run the full operator feature development workflow.
 
@@ -151,6 +233,10 @@ async def run_workflow(
         base_branch: The base branch to create feature branches from.
         on_message: Optional callback invoked with each conversation message
             dict as it arrives, enabling real-time streaming.
+        keep_conversation: Whether to collect every message in
+            WorkflowResult.conversation. Callers that consume messages via
+            on_message can pass False so tool results are not held in memory
+            for the whole run.
 
     Returns:
         A WorkflowResult with the output, PRs created, or error.
@@ -162,38 +248,33 @@ async def run_workflow(
 
     working_dir = tempfile.mkdtemp(prefix="oape-")
 
-    options = ClaudeAgentOptions(
-        system_prompt=(
-            "You are an OpenShift operator code generation assistant. "
-            "Follow the workflow instructions precisely and execute each step. "
-            "Use the OAPE plugins to generate code, tests, and reviews. "
-            "Create git branches, commits, and pull requests as instructed. "
-            "IMPORTANT: This is a fully automated pipeline. Execute ALL steps "
-            "and ALL PRs without pausing, asking for confirmation, or waiting "
-            "for user input. Never ask 'should I proceed?' or 'shall I continue?'. "
-            "Complete the entire workflow autonomously in one run."
-        ),
-        cwd=working_dir,
-        permission_mode="bypassPermissions",
-        allowed_tools=CONFIGS["claude_allowed_tools"],
-        plugins=[{"type": "local", "path": PLUGIN_DIR}],
-    )
+    options = ClaudeAgentOptions(cwd=working_dir, **_OPTIONS_TEMPLATE)
 
-    output_parts: list[str] = []
+    output = io.StringIO()
+    parts_count = 0
     conversation: list[dict] = []
     cost_usd = 0.0
 
     conv_logger.info(
-        f"\n{'=' * 60}\n[workflow] ep_url={ep_url}  repo={repo_url}  "
-        f"cwd={working_dir}\n{'=' * 60}"
+        "\n%s\n[workflow] ep_url=%s  repo=%s  cwd=%s\n%s",
+        _RULE, ep_url, repo_url, working_dir, _RULE,
     )
 
     def _emit(entry: dict) -> None:
         """Append to conversation and invoke on_message callback if set."""
-        conversation.append(entry)
+        if keep_conversation:
+            conversation.append(entry)
         if on_message is not None:
             on_message(entry)
 
+    def _append_output(text: str) -> None:
+        """Append a newline-separated part to the final output."""
+        nonlocal parts_count
+        if parts_count:
+            output.write("\n")
+        output.write(text)
+        parts_count += 1
+
     try:
         async for message in query(
             prompt=prompt,
@@ -202,14 +283,14 @@ async def run_workflow(
             if isinstance(message, AssistantMessage):
                 for block in message.content:
                     if isinstance(block, TextBlock):
-                        output_parts.append(block.text)
+                        _append_output(block.text)
                         entry = {
                             "type": "assistant",
                             "block_type": "text",
                             "content": block.text,
                         }
                         _emit(entry)
-                        conv_logger.info(f"[assistant] {block.text}")
+                        _log("assistant", block.text)
                     elif isinstance(block, ThinkingBlock):
                         entry = {
                             "type": "assistant",
@@ -217,7 +298,7 @@ async def run_workflow(
                             "content": block.thinking,
                         }
                         _emit(entry)
-                        conv_logger.info("[assistant:ThinkingBlock] (thinking)")
+                        _log("assistant:ThinkingBlock", "(thinking)")
                     elif isinstance(block, ToolUseBlock):
                         entry = {
                             "type": "assistant",
@@ -226,7 +307,7 @@ async def run_workflow(
                             "tool_input": block.input,
                         }
                         _emit(entry)
-                        conv_logger.info(f"[assistant:ToolUseBlock] {block.name}")
+                        _log("assistant:ToolUseBlock", block.name)
                     elif isinstance(block, ToolResultBlock):
                         content = block.content
                         if not isinstance(content, str):
@@ -239,9 +320,7 @@ async def run_workflow(
                             "is_error": block.is_error or False,
                         }
                         _emit(entry)
-                        conv_logger.info(
-                            f"[assistant:ToolResultBlock] {block.tool_use_id}"
-                        )
+                        _log("assistant:ToolResultBlock", block.tool_use_id)
                     else:
                         detail = json.dumps(
                             getattr(block, "__dict__", str(block)),
@@ -253,20 +332,18 @@ async def run_workflow(
                             "content": detail,
                         }
                         _emit(entry)
-                        conv_logger.info(
-                            f"[assistant:{type(block).__name__}] {detail}"
-                        )
+                        _log(f"assistant:{type(block).__name__}", detail)
             elif isinstance(message, ResultMessage):
                 cost_usd = message.total_cost_usd
                 if message.result:
-                    output_parts.append(message.result)
+                    _append_output(message.result)
                 entry = {
                     "type": "result",
                     "content": message.result,
                     "cost_usd": cost_usd,
                 }
                 _emit(entry)
-                conv_logger.info(f"[result] {message.result}  cost=${cost_usd:.4f}")
+                conv_logger.info("[result] %s  cost=$%.4f", message.result, cost_usd)
             else:
                 detail = json.dumps(
                     getattr(message, "__dict__", str(message)), default=str
@@ -276,16 +353,16 @@ async def run_workflow(
                     "content": detail,
                 }
                 _emit(entry)
-                conv_logger.info(f"[{type(message).__name__}] {detail}")
+                _log(type(message).__name__, detail)
 
-        conv_logger.info(f"[done] cost=${cost_usd:.4f}  parts={len(output_parts)}\n")
+        conv_logger.info("[done] cost=$%.4f  parts=%d\n", cost_usd, parts_count)
         return WorkflowResult(
-            output="\n".join(output_parts),
+            output=output.getvalue(),
             cost_usd=cost_usd,
             conversation=conversation,
         )
     except Exception as exc:
-        conv_logger.info(f"[error] {traceback.format_exc()}")
+        conv_logger.info("[error] %s", traceback.format_exc())
         return WorkflowResult(
             output="",
             cost_usd=cost_usd,
@@ -6,15 +6,19 @@ as JSON (one message per line), which the orchestrator streams as pod logs.
 """
 
 import asyncio
-import json
 import os
 import sys
 
-from rich import print_json
+import orjson
 
 from agent import run_workflow
 
 
+def print_message(msg: dict) -> None:
+    """Print a conversation message as a single compact JSON line."""
+    print(orjson.dumps(msg, default=str).decode(), flush=True)
+
+
 async def main():
     ep_url = os.environ.get("EP_URL")
     repo = os.environ.get("REPO_URL")
@@ -26,7 +30,11 @@ async def main():
 
     print(f"Starting workflow: ep_url={ep_url} repo={repo}", flush=True)
 
-    result = await run_workflow(ep_url, repo, base_branch, on_message=lambda msg: print_json(data=msg))
+    result = await run_workflow(
+        ep_url, repo, base_branch,
+        on_message=print_message,
+        keep_conversation=False,
+    )
 
     if result.success:
         print(f"WORKFLOW_SUCCESS cost=${result.cost_usd:.4f}", flush=True)
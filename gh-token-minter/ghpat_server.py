@@ -12,6 +12,10 @@ APP_ID = os.environ["GH_APP_ID"]
 PEM_FILE_PATH = os.environ["GH_APP_PEM_FILE_PATH"]
 LISTEN_PORT = int(os.environ.get("LISTEN_PORT", "8080"))
 
+# Reused across mints so repeat requests to api.github.com skip the TCP and
+# TLS handshake. HTTPServer handles one request at a time, so sharing is safe.
+_session = requests.Session()
+
 
 def mint_token():
     """Generate a GitHub App installation token."""
@@ -28,11 +32,11 @@ def mint_token():
         "X-GitHub-Api-Version": "2022-11-28",
     }
 
-    resp = requests.get("https://api.github.com/app/installations", headers=headers)
+    resp = _session.get("https://api.github.com/app/installations", headers=headers)
     resp.raise_for_status()
     inst_id = resp.json()[0]["id"]
 
-    resp = requests.post(
+    resp = _session.post(
         f"https://api.github.com/app/installations/{inst_id}/access_tokens",
         headers=headers,
     )
@@ -7,6 +7,7 @@ import (
 	"path/filepath"
 	"strconv"
 	"strings"
+	"time"
 )
 
 // RepoInfo holds metadata about an allowed operator repository.
@@ -27,6 +28,8 @@ type ServerConfig struct {
 	GCloudSecretName   string
 	GHTokenServiceURL  string
 	ConfigsConfigMap   string
+	SSECoalesceWindow  time.Duration
+	MaxConcurrentJobs  int
 	TeamRepos          []RepoInfo
 }
 
@@ -50,6 +53,24 @@ func LoadConfig() (*ServerConfig, error) {
 		ttl = int32(n)
 	}
 
+	coalesceMS := 25
+	if v := os.Getenv("SSE_COALESCE_MS"); v != "" {
+		n, err := strconv.Atoi(v)
+		if err != nil || n < 0 {
+			return nil, fmt.Errorf("invalid SSE_COALESCE_MS: %q", v)
+		}
+		coalesceMS = n
+	}
+
+	maxJobs := 4
+	if v := os.Getenv("MAX_CONCURRENT_WORKFLOWS"); v != "" {
+		n, err := strconv.Atoi(v)
+		if err != nil || n < 0 {
+			return nil, fmt.Errorf("invalid MAX_CONCURRENT_WORKFLOWS: %q", v)
+		}
+		maxJobs = n
+	}
+
 	namespace := os.Getenv("JOB_NAMESPACE")
 	if namespace == "" {
 		// Read from in-cluster service account.
@@ -76,6 +97,8 @@ func LoadConfig() (*ServerConfig, error) {
 		GCloudSecretName:   envOrDefault("GCLOUD_SECRET_NAME", "gcloud-adc"),
 		GHTokenServiceURL:  envOrDefault("GH_TOKEN_SERVICE_URL", "http://localhost:8081"),
 		ConfigsConfigMap:   envOrDefault("CONFIGS_CONFIGMAP", "shift-worker-config"),
+		SSECoalesceWindow:  time.Duration(coalesceMS) * time.Millisecond,
+		MaxConcurrentJobs:  maxJobs,
 		TeamRepos:          repos,
 	}, nil
 }
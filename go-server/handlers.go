@@ -1,8 +1,8 @@
 package main
 
 import (
-	"bufio"
 	"crypto/rand"
+	"crypto/sha256"
 	"embed"
 	"encoding/hex"
 	"encoding/json"
@@ -10,11 +10,9 @@ import (
 	"io"
 	"log"
 	"net/http"
-	"regexp"
+	"strconv"
+	"strings"
 	"time"
-
-	corev1 "k8s.io/api/core/v1"
-	metav1 "k8s.io/apimachinery/pkg/apis/meta/v1"
 )
 
 //go:embed static/homepage.html
@@ -22,11 +20,32 @@ var staticFS embed.FS
 
 // App holds shared dependencies for HTTP handlers.
 type App struct {
-	cfg *ServerConfig
-	k8s *K8sClient
+	cfg       *ServerConfig
+	k8s       *K8sClient
+	logs      *logHub
+	reposJSON []byte
 }
 
-var epURLPattern = regexp.MustCompile(`^https://github\.com/openshift/enhancements/pull/\d+/?$`)
+const epURLPrefix = "https://github.com/openshift/enhancements/pull/"
+
+// validEPURL reports whether s is an OpenShift enhancement PR URL: the
+// fixed prefix, a PR number and an optional trailing slash.
+func validEPURL(s string) bool {
+	num, ok := strings.CutPrefix(s, epURLPrefix)
+	if !ok {
+		return false
+	}
+	num = strings.TrimSuffix(num, "/")
+	if num == "" {
+		return false
+	}
+	for i := 0; i < len(num); i++ {
+		if num[i] < '0' || num[i] > '9' {
+			return false
+		}
+	}
+	return true
+}
 
 // CreateWorkflowRequest is the JSON body for POST /api/v1/workflows.
 type CreateWorkflowRequest struct {
@@ -70,6 +89,10 @@ type CreateWorkflowResponse struct {
 	Status string `json:"status"`
 }
 
+// maxGHTokenResponseBytes bounds the ghpat response read; a token payload is
+// a few hundred bytes.
+const maxGHTokenResponseBytes = 64 << 10
+
 // fetchGHToken requests a fresh GitHub App installation token from the ghpat HTTP service.
 // Returns the token and its expiry timestamp (ISO 8601 format).
 func fetchGHToken(serviceURL string) (token string, expiresAt string, err error) {
@@ -79,10 +102,13 @@ func fetchGHToken(serviceURL string) (token string, expiresAt string, err error)
 	}
 	defer resp.Body.Close()
 
-	body, err := io.ReadAll(resp.Body)
+	body, err := io.ReadAll(io.LimitReader(resp.Body, maxGHTokenResponseBytes+1))
 	if err != nil {
 		return "", "", fmt.Errorf("reading ghpat response: %w", err)
 	}
+	if len(body) > maxGHTokenResponseBytes {
+		return "", "", fmt.Errorf("ghpat response exceeds %d bytes", maxGHTokenResponseBytes)
+	}
 
 	if resp.StatusCode != http.StatusOK {
 		return "", "", fmt.Errorf("ghpat service returned %d: %s", resp.StatusCode, body)
@@ -119,22 +145,34 @@ func generateJobID() (string, error) {
 	return hex.EncodeToString(b), nil
 }
 
-// HandleHome serves the UI.
-func (a *App) HandleHome(w http.ResponseWriter, r *http.Request) {
+// homepage and homepageETag are computed once; the page is embedded and
+// cannot change while the process runs.
+var homepage, homepageETag = func() ([]byte, string) {
 	data, err := staticFS.ReadFile("static/homepage.html")
 	if err != nil {
-		http.Error(w, "internal error", http.StatusInternalServerError)
+		panic(err)
+	}
+	sum := sha256.Sum256(data)
+	return data, `"` + hex.EncodeToString(sum[:8]) + `"`
+}()
+
+// HandleHome serves the UI.
+func (a *App) HandleHome(w http.ResponseWriter, r *http.Request) {
+	w.Header().Set("ETag", homepageETag)
+	// Always revalidate so a deploy reaches users on the next load.
+	w.Header().Set("Cache-Control", "no-cache")
+	if r.Header.Get("If-None-Match") == homepageETag {
+		w.WriteHeader(http.StatusNotModified)
 		return
 	}
 	w.Header().Set("Content-Type", "text/html; charset=utf-8")
-	w.Write(data)
+	w.Write(homepage)
 }
 
 // HandleListRepos returns the list of allowed repositories.
 func (a *App) HandleListRepos(w http.ResponseWriter, r *http.Request) {
-	writeJSON(w, http.StatusOK, RepoListResponse{
-		Items: a.cfg.TeamRepos,
-	})
+	w.Header().Set("Content-Type", "application/json")
+	w.Write(a.reposJSON)
 }
 
 // HandleCreateWorkflow creates a K8s Job for a workflow run.
@@ -150,11 +188,25 @@ func (a *App) HandleCreateWorkflow(w http.ResponseWriter, r *http.Request) {
 		return
 	}
 
-	if !epURLPattern.MatchString(req.EPUrl) {
+	if !validEPURL(req.EPUrl) {
 		writeError(w, http.StatusBadRequest, "ep_url must be a valid OpenShift enhancement PR URL")
 		return
 	}
 
+	if a.cfg.MaxConcurrentJobs > 0 {
+		active, err := a.k8s.CountActiveJobs(r.Context())
+		if err != nil {
+			log.Printf("ERROR: counting active workflows: %v", err)
+			writeError(w, http.StatusInternalServerError, "failed to check running workflows")
+			return
+		}
+		if active >= a.cfg.MaxConcurrentJobs {
+			writeError(w, http.StatusTooManyRequests,
+				fmt.Sprintf("%d workflows are already running; try again later", active))
+			return
+		}
+	}
+
 	jobID, err := generateJobID()
 	if err != nil {
 		writeError(w, http.StatusInternalServerError, "failed to generate job ID")
@@ -242,6 +294,31 @@ func (a *App) HandleGetWorkflow(w http.ResponseWriter, r *http.Request) {
 	})
 }
 
+// lastEventID returns the "<epoch>-<line>" id of the last log event a
+// reconnecting SSE client received, from its Last-Event-ID header. ok is
+// false for a fresh connection; a malformed id yields ok with an empty
+// epoch.
+func lastEventID(r *http.Request) (epoch string, seq int, ok bool) {
+	v := r.Header.Get("Last-Event-ID")
+	if v == "" {
+		return "", 0, false
+	}
+	epoch, line, found := strings.Cut(v, "-")
+	n, err := strconv.Atoi(line)
+	if !found || err != nil || n < 0 {
+		return "", 0, true
+	}
+	return epoch, n, true
+}
+
+// sseHeartbeatInterval is how long a log stream may go without sending
+// anything before a comment line is written. Image pulls can leave the
+// stream quiet for minutes, and the OpenShift router closes connections
+// that stay idle past its timeout (30s by default).
+const sseHeartbeatInterval = 15 * time.Second
+
+var heartbeatComment = []byte(": ping\n\n")
+
 // HandleWorkflowLogs streams pod logs as SSE events.
 func (a *App) HandleWorkflowLogs(w http.ResponseWriter, r *http.Request) {
 	jobID := r.PathValue("job_id")
@@ -263,108 +340,78 @@ func (a *App) HandleWorkflowLogs(w http.ResponseWriter, r *http.Request) {
 
 	ctx := r.Context()
 
-	// Wait for the pod to be available (up to 5 minutes).
-	var podName string
-	deadline := time.Now().Add(5 * time.Minute)
-	for {
-		if time.Now().After(deadline) {
-			fmt.Fprintf(w, "event: complete\ndata: %s\n\n",
-				`{"status":"failed","message":"timed out waiting for pod"}`)
+	stream, release := a.logs.subscribe(jobID)
+	defer release()
+
+	// Resume after the last log line the client saw, if it was numbered by
+	// this producer. Otherwise (the stream lingered out, or the reconnect
+	// landed on another replica) its line numbers cannot be trusted, so
+	// tell the client and replay everything.
+	lastSeq := 0
+	if epoch, seq, ok := lastEventID(r); ok {
+		if epoch == stream.epoch {
+			lastSeq = seq
+		} else {
+			if _, err := w.Write(logResetFrame.data); err != nil {
+				return
+			}
 			flusher.Flush()
-			return
-		}
-
-		select {
-		case <-ctx.Done():
-			return
-		default:
-		}
-
-		name, err := a.k8s.GetJobPod(ctx, jobID)
-		if err == nil {
-			podName = name
-			break
-		}
-
-		fmt.Fprintf(w, "event: status\ndata: %s\n\n",
-			`{"status":"waiting_for_pod"}`)
-		flusher.Flush()
-
-		select {
-		case <-ctx.Done():
-			return
-		case <-time.After(2 * time.Second):
 		}
 	}
 
-	// Wait for pod to be running or terminated.
+	heartbeat := time.NewTicker(sseHeartbeatInterval)
+	defer heartbeat.Stop()
+
+	cursor := 0
 	for {
-		select {
-		case <-ctx.Done():
-			return
-		default:
+		frames, next, done, wake := stream.since(cursor)
+		for _, f := range frames {
+			if f.seq != 0 {
+				if f.seq <= lastSeq {
+					continue
+				}
+				// The lines in between were trimmed from the backlog before
+				// this client saw them.
+				if f.seq > lastSeq+1 {
+					if _, err := w.Write(logTruncatedFrame.data); err != nil {
+						return
+					}
+				}
+				lastSeq = f.seq
+			}
+			if _, err := w.Write(f.data); err != nil {
+				return
+			}
 		}
-
-		pod, err := a.k8s.clientset.CoreV1().Pods(a.k8s.namespace).Get(ctx, podName, metav1.GetOptions{})
-		if err != nil {
-			fmt.Fprintf(w, "event: status\ndata: %s\n\n",
-				`{"status":"waiting_for_pod"}`)
+		cursor = next
+		if len(frames) > 0 {
 			flusher.Flush()
-			time.Sleep(2 * time.Second)
-			continue
+			heartbeat.Reset(sseHeartbeatInterval)
 		}
-
-		phase := pod.Status.Phase
-		if phase == corev1.PodRunning || phase == corev1.PodSucceeded || phase == corev1.PodFailed {
-			break
-		}
-
-		fmt.Fprintf(w, "event: status\ndata: %s\n\n",
-			fmt.Sprintf(`{"status":"pod_%s"}`, string(phase)))
-		flusher.Flush()
-
-		select {
-		case <-ctx.Done():
+		if done {
 			return
-		case <-time.After(2 * time.Second):
 		}
-	}
-
-	// Stream pod logs.
-	logStream, err := a.k8s.StreamPodLogs(ctx, podName, true)
-	if err != nil {
-		log.Printf("ERROR: streaming logs for pod %s: %v", podName, err)
-		fmt.Fprintf(w, "event: complete\ndata: %s\n\n",
-			`{"status":"failed","message":"failed to stream logs"}`)
-		flusher.Flush()
-		return
-	}
-	defer logStream.Close()
-
-	scanner := bufio.NewScanner(logStream)
-	// Increase scanner buffer for long log lines.
-	scanner.Buffer(make([]byte, 0, 64*1024), 1024*1024)
 
-	for scanner.Scan() {
 		select {
 		case <-ctx.Done():
 			return
-		default:
+		case <-heartbeat.C:
+			if _, err := w.Write(heartbeatComment); err != nil {
+				return
+			}
+			flusher.Flush()
+			continue
+		case <-wake:
 		}
 
-		line := scanner.Text()
-		fmt.Fprintf(w, "event: log\ndata: %s\n\n", line)
-		flusher.Flush()
-	}
-
-	// Log stream ended — get final job status.
-	status, err := a.k8s.GetJobStatus(ctx, jobID)
-	if err != nil {
-		fmt.Fprintf(w, "event: complete\ndata: %s\n\n",
-			`{"status":"unknown","message":"could not determine final status"}`)
-	} else {
-		data, _ := json.Marshal(status)
-		fmt.Fprintf(w, "event: complete\ndata: %s\n\n", data)
+		// Agent output arrives in bursts; give the rest of the burst a
+		// moment to land so it goes out in a single flush.
+		if a.cfg.SSECoalesceWindow > 0 {
+			select {
+			case <-ctx.Done():
+				return
+			case <-time.After(a.cfg.SSECoalesceWindow):
+			}
+		}
 	}
-	flusher.Flush()
 }
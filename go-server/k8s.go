@@ -9,6 +9,7 @@ import (
 	corev1 "k8s.io/api/core/v1"
 	"k8s.io/apimachinery/pkg/api/resource"
 	metav1 "k8s.io/apimachinery/pkg/apis/meta/v1"
+	"k8s.io/apimachinery/pkg/watch"
 	"k8s.io/client-go/kubernetes"
 	"k8s.io/client-go/rest"
 	"k8s.io/client-go/tools/clientcmd"
@@ -112,7 +113,7 @@ func (c *K8sClient) CreateWorkflowJob(ctx context.Context, jobID string, params
 						{
 							Name:    "worker",
 							Image:   params.WorkerImage,
-							Command: []string{"sh", "-c", "python3.11 /app/main.py"},
+							Command: []string{"python3.11", "/app/main.py"},
 							Env: []corev1.EnvVar{
 								{Name: "EP_URL", Value: params.EPUrl},
 								{Name: "REPO_URL", Value: params.RepoURL},
@@ -207,35 +208,39 @@ func (c *K8sClient) GetJobStatus(ctx context.Context, jobID string) (*JobStatus,
 		return nil, fmt.Errorf("getting job %s: %w", jobName, err)
 	}
 
+	status, message := jobStatus(job)
+	return &JobStatus{Status: status, Message: message}, nil
+}
+
+// jobStatus derives the workflow status and failure message from a Job's
+// conditions and active pod count.
+func jobStatus(job *batchv1.Job) (status, message string) {
 	for _, cond := range job.Status.Conditions {
 		if cond.Type == batchv1.JobComplete && cond.Status == corev1.ConditionTrue {
-			return &JobStatus{Status: "succeeded"}, nil
+			return "succeeded", ""
 		}
 		if cond.Type == batchv1.JobFailed && cond.Status == corev1.ConditionTrue {
-			return &JobStatus{Status: "failed", Message: cond.Message}, nil
+			return "failed", cond.Message
 		}
 	}
 
 	if job.Status.Active > 0 {
-		return &JobStatus{Status: "running"}, nil
+		return "running", ""
 	}
-
-	return &JobStatus{Status: "pending"}, nil
+	return "pending", ""
 }
 
-// GetJobPod returns the name of the pod created by a workflow Job.
-func (c *K8sClient) GetJobPod(ctx context.Context, jobID string) (string, error) {
+// WatchJobPods watches the pods created by a workflow Job. Existing pods
+// are delivered first as Added events.
+func (c *K8sClient) WatchJobPods(ctx context.Context, jobID string) (watch.Interface, error) {
 	jobName := "shift-workflow-" + jobID
-	pods, err := c.clientset.CoreV1().Pods(c.namespace).List(ctx, metav1.ListOptions{
+	w, err := c.clientset.CoreV1().Pods(c.namespace).Watch(ctx, metav1.ListOptions{
 		LabelSelector: "job-name=" + jobName,
 	})
 	if err != nil {
-		return "", fmt.Errorf("listing pods for job %s: %w", jobName, err)
-	}
-	if len(pods.Items) == 0 {
-		return "", fmt.Errorf("no pods found for job %s", jobName)
+		return nil, fmt.Errorf("watching pods for job %s: %w", jobName, err)
 	}
-	return pods.Items[0].Name, nil
+	return w, nil
 }
 
 // StreamPodLogs returns a streaming reader of pod logs.
@@ -267,48 +272,39 @@ func (c *K8sClient) ListJobs(ctx context.Context) ([]JobInfo, error) {
 	}
 
 	var result []JobInfo
-	for _, job := range jobs.Items {
+	for i := range jobs.Items {
+		job := &jobs.Items[i]
 		jobID := job.Labels["job-id"]
 		if jobID == "" {
 			continue
 		}
+		result = append(result, jobInfo(jobID, job))
+	}
 
-		info := JobInfo{
-			ID:        jobID,
-			CreatedAt: job.CreationTimestamp.Format("2006-01-02T15:04:05Z"),
-		}
+	return result, nil
+}
 
-		// Determine status.
-		for _, cond := range job.Status.Conditions {
-			if cond.Type == batchv1.JobComplete && cond.Status == corev1.ConditionTrue {
-				info.Status = "succeeded"
-				break
-			}
-			if cond.Type == batchv1.JobFailed && cond.Status == corev1.ConditionTrue {
-				info.Status = "failed"
-				info.Message = cond.Message
-				break
-			}
-		}
-		if info.Status == "" {
-			if job.Status.Active > 0 {
-				info.Status = "running"
-			} else {
-				info.Status = "pending"
-			}
-		}
+// CountActiveJobs returns the number of workflow jobs that have not yet
+// succeeded or failed.
+func (c *K8sClient) CountActiveJobs(ctx context.Context) (int, error) {
+	jobs, err := c.clientset.BatchV1().Jobs(c.namespace).List(ctx, metav1.ListOptions{
+		LabelSelector: "app=shift-worker",
+	})
+	if err != nil {
+		return 0, fmt.Errorf("listing jobs: %w", err)
+	}
 
-		// Extract metadata from annotations.
-		if job.Annotations != nil {
-			info.RepoURL = job.Annotations["app-platform-shift.openshift.github.io/repo-url"]
-			info.EPUrl = job.Annotations["app-platform-shift.openshift.github.io/ep-url"]
-			info.BaseBranch = job.Annotations["app-platform-shift.openshift.github.io/base-branch"]
+	active := 0
+	for i := range jobs.Items {
+		job := &jobs.Items[i]
+		if job.Labels["job-id"] == "" {
+			continue
+		}
+		if status, _ := jobStatus(job); status == "running" || status == "pending" {
+			active++
 		}
-
-		result = append(result, info)
 	}
-
-	return result, nil
+	return active, nil
 }
 
 // GetJobInfo returns extended information for a single job.
@@ -319,30 +315,17 @@ func (c *K8sClient) GetJobInfo(ctx context.Context, jobID string) (*JobInfo, err
 		return nil, fmt.Errorf("getting job %s: %w", jobName, err)
 	}
 
-	info := &JobInfo{
+	info := jobInfo(jobID, job)
+	return &info, nil
+}
+
+// jobInfo builds a JobInfo from a workflow Job's status and annotations.
+func jobInfo(jobID string, job *batchv1.Job) JobInfo {
+	info := JobInfo{
 		ID:        jobID,
 		CreatedAt: job.CreationTimestamp.Format("2006-01-02T15:04:05Z"),
 	}
-
-	// Determine status.
-	for _, cond := range job.Status.Conditions {
-		if cond.Type == batchv1.JobComplete && cond.Status == corev1.ConditionTrue {
-			info.Status = "succeeded"
-			break
-		}
-		if cond.Type == batchv1.JobFailed && cond.Status == corev1.ConditionTrue {
-			info.Status = "failed"
-			info.Message = cond.Message
-			break
-		}
-	}
-	if info.Status == "" {
-		if job.Status.Active > 0 {
-			info.Status = "running"
-		} else {
-			info.Status = "pending"
-		}
-	}
+	info.Status, info.Message = jobStatus(job)
 
 	// Extract metadata from annotations.
 	if job.Annotations != nil {
@@ -351,5 +334,5 @@ func (c *K8sClient) GetJobInfo(ctx context.Context, jobID string) (*JobInfo, err
 		info.BaseBranch = job.Annotations["app-platform-shift.openshift.github.io/base-branch"]
 	}
 
-	return info, nil
+	return info
 }
@@ -0,0 +1,313 @@
+package main
+
+import (
+	"bufio"
+	"context"
+	"encoding/json"
+	"fmt"
+	"log"
+	"strconv"
+	"sync"
+	"time"
+
+	corev1 "k8s.io/api/core/v1"
+	"k8s.io/apimachinery/pkg/watch"
+)
+
+// logHub fans out a single pod log stream per job to every SSE subscriber
+// on this replica. Frames are encoded once by the producer and replayed to
+// each subscriber as raw bytes.
+type logHub struct {
+	k8s *K8sClient
+
+	mu      sync.Mutex
+	streams map[string]*jobStream
+}
+
+// maxBacklogBytes bounds the frames kept in memory per job. Once exceeded,
+// the oldest frames are dropped down to three quarters of the limit so the
+// trimming copy is amortized over many appends. Subscribers that attach or
+// resume after lines were dropped are sent a log_truncated status frame.
+const maxBacklogBytes = 32 << 20
+
+// streamLinger is how long a job's stream and producer are kept after the
+// last subscriber leaves, so a client that reconnects (EventSource does so
+// on its own) finds the same epoch and resumes from its Last-Event-ID
+// instead of getting a full replay.
+const streamLinger = 60 * time.Second
+
+// jobStream is the shared, append-only frame log for one job.
+type jobStream struct {
+	// epoch identifies this producer in SSE ids. Line numbers are only
+	// meaningful within one producer: a restarted producer re-reads the pod
+	// log from the API server, which serves only the current container log
+	// file, so after kubelet log rotation its line 1 is a different line.
+	epoch string
+
+	mu     sync.Mutex
+	frames []frame
+	base   int // number of frames dropped from the front of frames
+	size   int // total bytes of frames
+	done   bool
+	// wake is closed and replaced on every change, waking all waiting
+	// subscribers at once.
+	wake chan struct{}
+
+	refs   int         // guarded by logHub.mu
+	linger *time.Timer // guarded by logHub.mu; set while refs is 0
+	cancel context.CancelFunc
+}
+
+func newLogHub(k8s *K8sClient) *logHub {
+	return &logHub{k8s: k8s, streams: make(map[string]*jobStream)}
+}
+
+// subscribe attaches to the job's stream, starting the producer if this is
+// the first subscriber. release must be called when the subscriber leaves.
+func (h *logHub) subscribe(jobID string) (s *jobStream, release func()) {
+	h.mu.Lock()
+	s, ok := h.streams[jobID]
+	if !ok {
+		ctx, cancel := context.WithCancel(context.Background())
+		s = &jobStream{
+			epoch:  strconv.FormatInt(time.Now().UnixNano(), 36),
+			wake:   make(chan struct{}),
+			cancel: cancel,
+		}
+		h.streams[jobID] = s
+		go h.produce(ctx, jobID, s)
+	}
+	s.refs++
+	if s.linger != nil {
+		s.linger.Stop()
+		s.linger = nil
+	}
+	h.mu.Unlock()
+
+	release = func() {
+		h.mu.Lock()
+		defer h.mu.Unlock()
+		s.refs--
+		if s.refs > 0 {
+			return
+		}
+		// Stop following the pod once nobody has been watching for a while;
+		// a later viewer gets a new producer that replays the log from the
+		// API server.
+		var t *time.Timer
+		t = time.AfterFunc(streamLinger, func() {
+			h.mu.Lock()
+			defer h.mu.Unlock()
+			if s.linger != t {
+				return // a subscriber came back in the meantime
+			}
+			if h.streams[jobID] == s {
+				delete(h.streams, jobID)
+			}
+			s.cancel()
+		})
+		s.linger = t
+	}
+	return s, release
+}
+
+// frame is a pre-encoded SSE event. Log frames carry the 1-based pod log
+// line number, prefixed with the stream epoch, as their SSE id so clients
+// reconnecting to the same producer can resume; status and completion
+// frames have seq 0 and no id.
+type frame struct {
+	seq  int
+	data []byte
+}
+
+// since returns the frames from the absolute position cursor onward, the
+// position after them, whether the stream has ended, and a channel that is
+// closed on the next change. A cursor that has fallen behind the retained
+// backlog skips ahead to the oldest retained frame.
+func (s *jobStream) since(cursor int) (frames []frame, next int, done bool, wake <-chan struct{}) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	if cursor < s.base {
+		cursor = s.base
+	}
+	frames = s.frames[cursor-s.base:]
+	return frames, cursor + len(frames), s.done, s.wake
+}
+
+func (s *jobStream) publish(f frame) {
+	s.mu.Lock()
+	s.frames = append(s.frames, f)
+	s.size += len(f.data)
+	if s.size > maxBacklogBytes {
+		s.trimLocked()
+	}
+	s.wakeLocked()
+	s.mu.Unlock()
+}
+
+// trimLocked drops the oldest frames. Subscribers may still be reading the
+// current backing array, so the retained frames are copied to a new one.
+func (s *jobStream) trimLocked() {
+	drop := 0
+	for s.size > maxBacklogBytes*3/4 && drop < len(s.frames)-1 {
+		s.size -= len(s.frames[drop].data)
+		drop++
+	}
+	s.frames = append([]frame(nil), s.frames[drop:]...)
+	s.base += drop
+}
+
+func (s *jobStream) finish() {
+	s.mu.Lock()
+	s.done = true
+	s.wakeLocked()
+	s.mu.Unlock()
+}
+
+func (s *jobStream) wakeLocked() {
+	close(s.wake)
+	s.wake = make(chan struct{})
+}
+
+// Frames with fixed payloads are encoded once and shared by every stream.
+var (
+	waitingForPodFrame = sseFrame("status", `{"status":"waiting_for_pod"}`)
+	podTimeoutFrame    = sseFrame("complete", `{"status":"failed","message":"timed out waiting for pod"}`)
+	logsFailedFrame    = sseFrame("complete", `{"status":"failed","message":"failed to stream logs"}`)
+	unknownStatusFrame = sseFrame("complete", `{"status":"unknown","message":"could not determine final status"}`)
+	logTruncatedFrame  = sseFrame("status", `{"status":"log_truncated","message":"earlier output was dropped from the server backlog"}`)
+	logResetFrame      = sseFrame("status", `{"status":"log_reset","message":"log stream restarted; replaying from the start of the current pod log"}`)
+)
+
+func sseFrame(event, data string) frame {
+	b := make([]byte, 0, len("event: \ndata: \n\n")+len(event)+len(data))
+	b = append(b, "event: "...)
+	b = append(b, event...)
+	b = append(b, "\ndata: "...)
+	b = append(b, data...)
+	b = append(b, "\n\n"...)
+	return frame{data: b}
+}
+
+// logFrame builds a log frame in a single allocation, copying line out of
+// the scanner's buffer.
+func logFrame(epoch string, seq int, line []byte) frame {
+	b := make([]byte, 0, len("id: -\nevent: log\ndata: \n\n")+len(epoch)+20+len(line))
+	b = append(b, "id: "...)
+	b = append(b, epoch...)
+	b = append(b, '-')
+	b = strconv.AppendInt(b, int64(seq), 10)
+	b = append(b, "\nevent: log\ndata: "...)
+	b = append(b, line...)
+	b = append(b, "\n\n"...)
+	return frame{seq: seq, data: b}
+}
+
+// waitForPod watches the job's pod until it is running or terminated,
+// publishing a status frame whenever its phase changes. It reports false
+// if ctx is cancelled or no pod appears within 5 minutes.
+func (h *logHub) waitForPod(ctx context.Context, jobID string, s *jobStream) (string, bool) {
+	s.publish(waitingForPodFrame)
+
+	deadline := time.NewTimer(5 * time.Minute)
+	defer deadline.Stop()
+	timedOut := deadline.C
+
+	var lastPhase corev1.PodPhase
+	for attempt := 0; ; attempt++ {
+		if attempt > 0 {
+			// Back off before re-establishing the watch so one that keeps
+			// failing or being closed does not hammer the API server.
+			select {
+			case <-ctx.Done():
+				return "", false
+			case <-timedOut:
+				s.publish(podTimeoutFrame)
+				return "", false
+			case <-time.After(2 * time.Second):
+			}
+		}
+
+		watcher, err := h.k8s.WatchJobPods(ctx, jobID)
+		if err != nil {
+			log.Printf("ERROR: %v", err)
+			continue
+		}
+
+	events:
+		for {
+			select {
+			case <-ctx.Done():
+				watcher.Stop()
+				return "", false
+			case <-timedOut:
+				watcher.Stop()
+				s.publish(podTimeoutFrame)
+				return "", false
+			case ev, open := <-watcher.ResultChan():
+				if !open {
+					// The API server closed the watch; re-establish it
+					// after the backoff.
+					break events
+				}
+				pod, isPod := ev.Object.(*corev1.Pod)
+				if !isPod || ev.Type == watch.Deleted {
+					continue
+				}
+				// The pod exists, so the deadline no longer applies.
+				timedOut = nil
+
+				phase := pod.Status.Phase
+				if phase == corev1.PodRunning || phase == corev1.PodSucceeded || phase == corev1.PodFailed {
+					watcher.Stop()
+					return pod.Name, true
+				}
+				if phase != lastPhase {
+					lastPhase = phase
+					s.publish(sseFrame("status", fmt.Sprintf(`{"status":"pod_%s"}`, string(phase))))
+				}
+			}
+		}
+		watcher.Stop()
+	}
+}
+
+// produce waits for the job's pod, follows its logs and publishes every
+// line as an SSE frame, ending with a "complete" frame.
+func (h *logHub) produce(ctx context.Context, jobID string, s *jobStream) {
+	defer s.finish()
+
+	podName, ok := h.waitForPod(ctx, jobID, s)
+	if !ok {
+		return
+	}
+
+	// Stream pod logs.
+	logStream, err := h.k8s.StreamPodLogs(ctx, podName, true)
+	if err != nil {
+		log.Printf("ERROR: streaming logs for pod %s: %v", podName, err)
+		s.publish(logsFailedFrame)
+		return
+	}
+	defer logStream.Close()
+
+	scanner := bufio.NewScanner(logStream)
+	// Increase scanner buffer for long log lines.
+	scanner.Buffer(make([]byte, 0, 64*1024), 1024*1024)
+
+	for seq := 1; scanner.Scan(); seq++ {
+		s.publish(logFrame(s.epoch, seq, scanner.Bytes()))
+	}
+	if ctx.Err() != nil {
+		return
+	}
+
+	// Log stream ended — get final job status.
+	status, err := h.k8s.GetJobStatus(ctx, jobID)
+	if err != nil {
+		s.publish(unknownStatusFrame)
+	} else {
+		data, _ := json.Marshal(status)
+		s.publish(sseFrame("complete", string(data)))
+	}
+}
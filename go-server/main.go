@@ -1,6 +1,7 @@
 package main
 
 import (
+	"encoding/json"
 	"log"
 	"net/http"
 )
@@ -16,9 +17,17 @@ func main() {
 		log.Fatalf("failed to create k8s client: %v", err)
 	}
 
+	// The repo list never changes after startup, so encode it once.
+	reposJSON, err := json.Marshal(RepoListResponse{Items: cfg.TeamRepos})
+	if err != nil {
+		log.Fatalf("failed to encode repo list: %v", err)
+	}
+
 	app := &App{
-		cfg: cfg,
-		k8s: k8s,
+		cfg:       cfg,
+		k8s:       k8s,
+		logs:      newLogHub(k8s),
+		reposJSON: reposJSON,
 	}
 
 	mux := http.NewServeMux()
@@ -12,6 +12,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import re
 
+from github_repo_analyzer import write_cache_file
+
 
 class GitHubPRAnalyzer:
     """Analyzes GitHub PRs for historical context"""
@@ -48,7 +50,7 @@ class GitHubPRAnalyzer:
                 # Cache successful results
                 if cache_key and output:
                     cache_file = self.cache_dir / f"{cache_key}.json"
-                    cache_file.write_text(output)
+                    write_cache_file(cache_file, output)
                 return output
             else:
                 return None
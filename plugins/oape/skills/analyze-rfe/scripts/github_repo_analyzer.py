@@ -8,10 +8,36 @@ import json
 import os
 import subprocess
 import sys
+import tempfile
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 
+def write_cache_file(cache_file: Path, output: str) -> None:
+    """
+    Atomically write a gh result cache entry
+
+    The cache directory is shared by every run in the workspace, so the
+    content goes to a uniquely named temp file that is then renamed over
+    cache_file. An interrupted or concurrent write never leaves a partial
+    entry that a later run would read as a cache hit.
+
+    Args:
+        cache_file: Final path of the cache entry
+        output: Content to cache
+    """
+    tmp = tempfile.NamedTemporaryFile(
+        "w", dir=cache_file.parent, prefix=cache_file.name + ".", suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(output)
+        os.replace(tmp.name, cache_file)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+
+
 class GitHubRepoAnalyzer:
     """Analyzes GitHub repositories remotely via gh CLI"""
 
@@ -75,7 +101,7 @@ class GitHubRepoAnalyzer:
                 # Cache successful results
                 if cache_key and output:
                     cache_file = self.cache_dir / f"{cache_key}.json"
-                    cache_file.write_text(output)
+                    write_cache_file(cache_file, output)
                 return output
             else:
                 # Not an error, just no results (e.g., repo not found)
@@ -10,6 +10,8 @@ import subprocess
 from typing import List, Dict, Optional
 from pathlib import Path
 
+from github_repo_analyzer import write_cache_file
+
 
 class OperandDiscovery:
     """Discovers operands managed by an operator"""
@@ -39,7 +41,7 @@ class OperandDiscovery:
                 output = result.stdout.strip()
                 if cache_key and output:
                     cache_file = self.cache_dir / f"{cache_key}.json"
-                    cache_file.write_text(output)
+                    write_cache_file(cache_file, output)
                 return output
             else:
                 return None